@@ -192,8 +192,7 @@ class TestClient(unittest.TestCase):
             result = c.find_coordinates("SW1A 2AA", "10 Downing Street")
             self.assertEqual(result.uprn, 100023336956)
         # Pools should be closed
-        self.assertIsNone(c._epc_pool._conn)
-        self.assertIsNone(c._os_pool._conn)
+        self.assertIsNone(c._pool._conn)
 
     def test_to_dict(self):
         client = self._make_client()
@@ -0,0 +1,45 @@
+"""
+Pure-Python bit-parallel scoring, used when neither RapidFuzz nor Numba
+is installed.
+
+Computes the same normalised Indel similarity as rapidfuzz.fuzz.ratio
+with Hyyrö's bit-vector LCS algorithm: the query is turned into one
+bitmask per character, and each candidate character then costs a few
+integer operations instead of a row of the dynamic programme. Python
+ints serve as bit vectors of any width, so there is no 64-character
+limit.
+"""
+
+
+def pattern_masks(text: str) -> dict[str, int]:
+    """Map each character of *text* to a bitmask of its positions."""
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(text):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def lcs_length(masks: dict[str, int], length: int, text: str) -> int:
+    """
+    Return the LCS length of *text* and the string behind *masks*.
+
+    *length* is the length of that string. Each zero bit left in the
+    state vector marks one matched character.
+    """
+    full = (1 << length) - 1
+    state = full
+    get = masks.get
+    for ch in text:
+        match = get(ch)
+        if match:  # characters absent from the pattern leave state as is
+            u = state & match
+            state = ((state + u) | (state - u)) & full
+    return length - bin(state).count("1")
+
+
+def indel_ratio(a: str, b: str) -> float:
+    """Return 2 * LCS(a, b) / (len(a) + len(b)), in 0.0-1.0."""
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return 2.0 * lcs_length(pattern_masks(b), len(b), a) / total
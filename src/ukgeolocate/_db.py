@@ -1,10 +1,33 @@
 """Internal database connection management."""
 
 import sqlite3
+import threading
 from pathlib import Path
+from typing import Optional
 
 from ukgeolocate.exceptions import DatabaseInvalid, DatabaseNotFound
 
+try:
+    import apsw
+except ImportError:  # optional dependency — only driver="apsw" needs it
+    apsw = None
+
+_DRIVERS = ("sqlite3", "apsw")
+
+# Prepared statements kept per connection. The client only issues a
+# handful of distinct queries, so this never evicts.
+_STATEMENT_CACHE_SIZE = 64
+
+# Read-path tuning applied to every connection. Lookups are random reads
+# into the postcode index, so keeping pages memory-mapped and cached
+# avoids a read() syscall per page.
+_DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+_DEFAULT_CACHE_SIZE = 64 * 1024 * 1024  # bytes
+
+# How long a read waits on a lock held by a writer (e.g. build-index)
+# before giving up with "database is locked".
+_BUSY_TIMEOUT = 5.0  # seconds
+
 
 class _DatabasePool:
     """
@@ -13,66 +36,188 @@ class _DatabasePool:
     SQLite in WAL mode supports concurrent readers, so holding a
     connection open across requests is safe and avoids the overhead
     of repeated open/close cycles.
+
+    Further databases can be ATTACHed to the same connection, so a
+    lookup spanning several files shares one connection, lock and
+    prepared-statement cache. Each file keeps its own path and display
+    name for error reporting.
+
+    The connection may be shared between threads. Each query and its
+    fetch run under a lock, so callers get fully materialised rows and
+    never step a cursor another thread is using.
+
+    *driver* "apsw" opens the connection with APSW instead of the
+    sqlite3 module. Its thinner binding trims the per-query overhead;
+    queries, PRAGMAs and rows are the same either way.
     """
 
-    def __init__(self, path: Path, name: str):
-        self._path = path
-        self._name = name
-        self._conn: sqlite3.Connection | None = None
+    def __init__(
+        self,
+        path: Path,
+        name: str,
+        mmap_size: int = _DEFAULT_MMAP_SIZE,
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+        driver: str = "sqlite3",
+    ):
+        if driver not in _DRIVERS:
+            raise ValueError(
+                f"unknown driver {driver!r}; expected one of {_DRIVERS}"
+            )
+        if driver == "apsw" and apsw is None:
+            raise ImportError("driver='apsw' needs the apsw package")
+        self._driver = driver
+        # What a query raises on a database file that has gone away
+        self._stale_error = (
+            apsw.Error if driver == "apsw" else sqlite3.OperationalError
+        )
+        # schema name -> (path, display name); "main" is the opened file
+        self._databases: dict[str, tuple[Path, str]] = {"main": (path, name)}
+        self._mmap_size = int(mmap_size)
+        self._cache_size = int(cache_size)
+        self._conn = None  # a sqlite3 or apsw Connection once opened
+        self._unattached: set[str] = set()  # schemas whose file was missing
+        self._lock = threading.RLock()
+
+    def attach(self, schema: str, path: Path, name: str) -> None:
+        """
+        Make another read-only database available as *schema*.
+
+        Queries address its tables as "schema.table". A missing file is
+        reported as DatabaseNotFound when the schema is queried.
+        """
+        with self._lock:
+            self._databases[schema] = (path, name)
+            if self._conn is not None:
+                self._attach(schema)
 
-    def get_connection(self) -> sqlite3.Connection:
+    def get_connection(self):
         """Return an open read-only connection, creating one if needed."""
-        if self._conn is None:
-            self._open()
-        return self._conn
+        with self._lock:
+            if self._conn is None:
+                self._open()
+            return self._conn
 
-    def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+    def execute(self, sql: str, params: tuple = ()):
         """
         Execute a query, reconnecting if the database has gone stale.
 
-        In a long-running process the DB file could be deleted or
+        In a long-running process a DB file could be deleted or
         replaced after the initial connection was opened. This catches
-        the resulting OperationalError and raises DatabaseNotFound so
-        callers get a clean, expected exception.
+        the resulting driver error and raises DatabaseNotFound so
+        callers get a clean, expected exception. Hold the pool's lock
+        while iterating the cursor if other threads share the pool;
+        fetchall and fetchone do that for you.
         """
-        conn = self.get_connection()
-        try:
-            return conn.execute(sql, params)
-        except sqlite3.OperationalError:
-            # Connection may be stale — check if the file still exists
-            if not self._path.is_file():
-                self.close()
-                raise DatabaseNotFound(str(self._path), self._name)
-            raise  # genuine query error, not a missing file
+        with self._lock:
+            conn = self.get_connection()
+            for schema in list(self._unattached):  # the file may be back
+                self._attach(schema)
+            try:
+                return conn.execute(sql, params)
+            except self._stale_error:
+                # Connection may be stale — check the files still exist
+                for path, name in self._databases.values():
+                    if not path.is_file():
+                        self.close()
+                        raise DatabaseNotFound(str(path), name)
+                raise  # genuine query error, not a missing file
+
+    def fetchall(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Execute a query and return all of its rows."""
+        with self._lock:
+            return self.execute(sql, params).fetchall()
+
+    def fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        """Execute a query and return its first row, or None."""
+        with self._lock:
+            return self.execute(sql, params).fetchone()
 
     def _open(self) -> None:
-        """Open a fresh read-only connection."""
-        if not self._path.is_file():
-            raise DatabaseNotFound(str(self._path), self._name)
-        self._conn = sqlite3.connect(
-            f"file:{self._path}?mode=ro", uri=True
-        )
+        """Open a fresh read-only connection and re-attach databases."""
+        path, name = self._databases["main"]
+        if not path.is_file():
+            raise DatabaseNotFound(str(path), name)
+        if self._driver == "apsw":
+            self._conn = apsw.Connection(
+                f"file:{path}?mode=ro",
+                flags=apsw.SQLITE_OPEN_READONLY | apsw.SQLITE_OPEN_URI,
+                statementcachesize=_STATEMENT_CACHE_SIZE,
+            )
+            self._conn.set_busy_timeout(int(_BUSY_TIMEOUT * 1000))
+        else:
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro",
+                uri=True,
+                timeout=_BUSY_TIMEOUT,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+            )
         self._conn.execute("PRAGMA query_only = ON")
+        self._conn.execute("PRAGMA temp_store = MEMORY")
+        self._tune("main")
+        for schema in self._databases:
+            if schema != "main":
+                self._attach(schema)
 
-    def validate_tables(self, expected: list[str]) -> None:
+    def _attach(self, schema: str) -> None:
         """
-        Check that the database contains the expected tables.
+        ATTACH *schema* to the open connection, if its file exists.
 
-        Raises DatabaseInvalid if any are missing.
+        A missing file is left unattached rather than failing the whole
+        connection, so the main database stays usable and reports its
+        own health. Queries on the schema then fail, and execute()
+        raises DatabaseNotFound for that file; each later query retries
+        the ATTACH.
         """
-        cur = self.execute(
-            "SELECT name FROM sqlite_master WHERE type='table'"
+        path, _ = self._databases[schema]
+        if not path.is_file():
+            self._unattached.add(schema)
+            return
+        self._conn.execute(
+            f"ATTACH DATABASE ? AS {schema}", (f"file:{path}?mode=ro",)
+        )
+        self._unattached.discard(schema)
+        self._tune(schema)
+
+    def _tune(self, schema: str) -> None:
+        """Apply the per-file read-path PRAGMAs to *schema*."""
+        # None of these write to the file, so they are safe under mode=ro.
+        # Negative cache_size is in KiB rather than pages.
+        self._conn.execute(f"PRAGMA {schema}.mmap_size = {self._mmap_size}")
+        self._conn.execute(
+            f"PRAGMA {schema}.cache_size = -{self._cache_size // 1024}"
         )
-        actual = {row[0] for row in cur}
+
+    def validate_tables(self, expected: list[str], schema: str = "main") -> None:
+        """
+        Check that the *schema* database contains the expected tables.
+
+        Raises DatabaseNotFound if its file is gone, and DatabaseInvalid
+        if any tables are missing.
+        """
+        path, name = self._databases[schema]
+        if not path.is_file():
+            raise DatabaseNotFound(str(path), name)
+        rows = self.fetchall(
+            f"SELECT name FROM {schema}.sqlite_master WHERE type='table'"
+        )
+        actual = {row[0] for row in rows}
         missing = set(expected) - actual
         if missing:
             raise DatabaseInvalid(
-                str(self._path),
+                str(path),
                 f"missing tables: {', '.join(sorted(missing))}",
             )
 
+    def columns(self, table: str) -> set[str]:
+        """Return the column names of *table* (empty if it doesn't exist)."""
+        rows = self.fetchall(f"PRAGMA table_info({table})")
+        return {row[1] for row in rows}
+
     def close(self) -> None:
         """Close the connection if open."""
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._unattached.clear()
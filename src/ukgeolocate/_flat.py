@@ -0,0 +1,116 @@
+"""Internal memory-mapped flat index of EPC candidates, keyed by postcode."""
+
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from ukgeolocate.exceptions import DatabaseInvalid, DatabaseNotFound
+
+# File layout (all integers little-endian):
+#   header     magic, directory offset, directory entry count
+#   records    per postcode: int64 UPRNs, then UTF-8 text holding the
+#              display addresses followed by the scoring choices, all
+#              separated by FIELD_SEP
+#   directory  fixed-width entries sorted by NUL-padded postcode
+MAGIC = b"UKGEOIX1"
+HEADER = struct.Struct("<8sQQ")
+ENTRY = struct.Struct("<8sQII")  # postcode, record offset, rows, text bytes
+FIELD_SEP = "\x1f"
+KEY_WIDTH = 8
+
+
+def postcode_key(norm_postcode: str) -> bytes:
+    """Directory key for a normalised postcode."""
+    return norm_postcode.encode("ascii").ljust(KEY_WIDTH, b"\0")
+
+
+class _FlatIndex:
+    """
+    Read-only view of a flat index built by index.build_flat_index.
+
+    The file is memory-mapped, so lookups are a binary search over the
+    directory plus two slices; no SQL is parsed and no rows are
+    reconstructed one value at a time.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._mm: Optional[mmap.mmap] = None
+        self._dir = self._count = 0
+        # Guards the mapping: close() must not unmap it mid-lookup
+        self._lock = threading.Lock()
+        with self._lock:
+            self._open()
+
+    def _open(self) -> None:
+        """Map the file and check its header. Call with the lock held."""
+        path = self._path
+        if not path.is_file():
+            raise DatabaseNotFound(str(path), "EPC flat index")
+        # mmap refuses empty files, and anything shorter has no header
+        if path.stat().st_size < HEADER.size:
+            raise DatabaseInvalid(str(path), "not a ukgeolocate flat index")
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, directory, count = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            raise DatabaseInvalid(str(path), "not a ukgeolocate flat index")
+        # The directory is written last, so a cut-off file loses it
+        if directory + count * ENTRY.size > len(mm):
+            mm.close()
+            raise DatabaseInvalid(str(path), "flat index is truncated")
+        # Publish the mapping only once it is checked and described
+        self._dir, self._count = directory, count
+        self._mm = mm
+
+    def candidates(
+        self, norm_postcode: str
+    ) -> tuple[list[tuple[int, str]], list[str]]:
+        """
+        Return (owners, choices) for *norm_postcode*, like the SQL path.
+
+        Remaps the file if close() has been called, just as the database
+        pool reconnects.
+        """
+        key = postcode_key(norm_postcode)
+        with self._lock:
+            if self._mm is None:
+                self._open()
+            mm, directory, count = self._mm, self._dir, self._count
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                pos = directory + mid * ENTRY.size
+                if mm[pos:pos + KEY_WIDTH] < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == count:
+                return [], []
+            found, offset, rows, text_len = ENTRY.unpack_from(
+                mm, directory + lo * ENTRY.size
+            )
+            if found != key:
+                return [], []
+            uprn_bytes = mm[offset:offset + 8 * rows]
+            start = offset + 8 * rows
+            text = mm[start:start + text_len]
+
+        uprns = array("q")
+        uprns.frombytes(uprn_bytes)
+        if sys.byteorder == "big":
+            uprns.byteswap()
+        fields = text.decode("utf-8").split(FIELD_SEP)
+        return list(zip(uprns, fields[:rows])), fields[rows:]
+
+    def close(self) -> None:
+        """Unmap the file if mapped."""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
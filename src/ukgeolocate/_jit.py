@@ -0,0 +1,68 @@
+"""
+Numba-compiled scoring kernels, used when RapidFuzz is not installed.
+
+Importing this module requires numba and numpy; address.py only does so
+as a fallback. The kernels compute the same normalised Indel similarity
+as rapidfuzz.fuzz.ratio, so scores agree across backends.
+"""
+
+import numba
+import numpy as np
+
+
+def encode(text: str) -> np.ndarray:
+    """View *text* as an array of code points for the kernels."""
+    # surrogatepass keeps lone surrogates as code points rather than
+    # raising, so this accepts any str the other backends do
+    return np.frombuffer(
+        text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+    )
+
+
+@numba.njit(cache=True)
+def indel_ratio(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Return 2 * LCS(a, b) / (len(a) + len(b)), in 0.0-1.0.
+
+    Classic LCS dynamic programme kept to a single rolling row.
+    """
+    la = a.shape[0]
+    lb = b.shape[0]
+    if la + lb == 0:
+        return 1.0
+    row = np.zeros(lb + 1, dtype=np.int32)
+    for i in range(la):
+        ai = a[i]
+        diag = 0  # row[j] from the previous pass
+        for j in range(lb):
+            above = row[j + 1]
+            if ai == b[j]:
+                row[j + 1] = diag + 1
+            elif row[j] > above:
+                row[j + 1] = row[j]
+            diag = above
+    return 2.0 * row[lb] / (la + lb)
+
+
+def pack(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack *texts* into one flat code point buffer plus offsets.
+
+    Text i occupies buffer[offsets[i]:offsets[i + 1]]. A single encode
+    call for the whole batch keeps packing cost off the Python side.
+    """
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+    return encode("".join(texts)), offsets
+
+
+@numba.njit(parallel=True, cache=True)
+def indel_ratios(
+    buffer: np.ndarray, offsets: np.ndarray, query: np.ndarray
+) -> np.ndarray:
+    """Score every packed text against *query*, spread across cores."""
+    n = offsets.shape[0] - 1
+    out = np.empty(n, dtype=np.float64)
+    for i in numba.prange(n):
+        out[i] = indel_ratio(buffer[offsets[i] : offsets[i + 1]], query)
+    return out
@@ -6,10 +6,13 @@ Thin wrapper around the ukgeolocate library.
 Usage:
     ukgeolocate                          # interactive mode
     ukgeolocate "SW1A 2AA" "10 Downing"  # single lookup
+    ukgeolocate build-index [EPC_DB]     # precompute normalised addresses
+    ukgeolocate build-index --flat [EPC_DB]  # ...and write EPC_DB.idx
 
 Database paths are read from environment variables:
     EPCLOCATIONS_DB   Path to EPClocations.db
     OSOPENUPRN_DB     Path to OSOpenUPRN.db
+    EPCLOCATIONS_IDX  Optional flat index from 'build-index --flat'
 
 If not set, looks for the files in the current working directory.
 """
@@ -25,6 +28,7 @@ from ukgeolocate.exceptions import (
     PostcodeInvalid,
     UKGeolocateError,
 )
+from ukgeolocate.index import build_flat_index, build_index
 from ukgeolocate.postcode import validate
 
 # ── Default database paths ────────────────────────────────────
@@ -36,6 +40,7 @@ _DEFAULT_EPC = os.environ.get(
 _DEFAULT_OS = os.environ.get(
     "OSOPENUPRN_DB", str(Path.cwd() / "OSOpenUPRN.db")
 )
+_DEFAULT_IDX = os.environ.get("EPCLOCATIONS_IDX")
 
 _BANNER = """\
 ╔══════════════════════════════════════╗
@@ -45,6 +50,21 @@ _BANNER = """\
 Type 'q' to quit.
 """
 
+# Filled with one format_map call per lookup.
+_RESULT_TMPL = """\
+\r  ✓ Match found ({confidence} confidence)
+
+  ┌──────────────────────────────────────────────────────┐
+  │  Matched Address   {matched_address:<35}│
+  │  UPRN              {uprn:<35}│
+  │  Easting           {easting:<35}│
+  │  Northing          {northing:<35}│
+  │  Latitude          {latitude:<35}│
+  │  Longitude         {longitude:<35}│
+  │  Match Confidence  {confidence:<35}│
+  └──────────────────────────────────────────────────────┘
+"""
+
 
 def _run_interactive(client: UKGeolocate) -> None:
     print(_BANNER)
@@ -94,23 +114,39 @@ def _run_interactive(client: UKGeolocate) -> None:
 
         # -- Display ----------------------------------------------------
         confidence = f"{result.match_score:.0%}"
-        print(f"\r  ✓ Match found ({confidence} confidence)")
-        print()
-        print(f"  ┌──────────────────────────────────────────────────────┐")
-        print(f"  │  Matched Address   {result.matched_address:<35}│")
-        print(f"  │  UPRN              {result.uprn:<35}│")
-        print(f"  │  Easting           {result.easting:<35}│")
-        print(f"  │  Northing          {result.northing:<35}│")
-        print(f"  │  Latitude          {result.latitude:<35}│")
-        print(f"  │  Longitude         {result.longitude:<35}│")
-        print(f"  │  Match Confidence  {confidence:<35}│")
-        print(f"  └──────────────────────────────────────────────────────┘")
+        print(
+            _RESULT_TMPL.format_map(
+                {**result.to_dict(), "confidence": confidence}
+            ),
+            end="",
+        )
+
+
+def _run_build_index(args: list[str]) -> None:
+    flat = "--flat" in args
+    args = [arg for arg in args if arg != "--flat"]
+    epc_db = args[0] if args else _DEFAULT_EPC
+    try:
+        rows = build_index(epc_db)
+        flat_path = build_flat_index(epc_db) if flat else None
+    except UKGeolocateError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(2)
+    print(f"Indexed {rows} addresses in {epc_db}")
+    if flat_path is not None:
+        print(f"Wrote flat index to {flat_path}")
 
 
 def main() -> None:
     """Entry point — supports both CLI args and interactive mode."""
+    if len(sys.argv) >= 2 and sys.argv[1] == "build-index":
+        _run_build_index(sys.argv[2:])
+        return
+
     try:
-        client = UKGeolocate(epc_db=_DEFAULT_EPC, os_db=_DEFAULT_OS)
+        client = UKGeolocate(
+            epc_db=_DEFAULT_EPC, os_db=_DEFAULT_OS, epc_index=_DEFAULT_IDX
+        )
     except DatabaseNotFound as exc:
         print(f"Error: {exc}", file=sys.stderr)
         print(
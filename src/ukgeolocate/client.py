@@ -2,15 +2,98 @@
 
 from __future__ import annotations
 
+from array import array
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from ukgeolocate import address, postcode
-from ukgeolocate._db import _DatabasePool
-from ukgeolocate.exceptions import NoMatchFound
+from ukgeolocate._db import (
+    _DEFAULT_CACHE_SIZE,
+    _DEFAULT_MMAP_SIZE,
+    _DatabasePool,
+)
+from ukgeolocate._flat import _FlatIndex
+from ukgeolocate.exceptions import (
+    DatabaseInvalid,
+    DatabaseNotFound,
+    NoMatchFound,
+)
+from ukgeolocate.index import FULL_ADDRESS_SQL, NORM_COLUMNS, VALID_UPRN_SQL
 from ukgeolocate.models import LookupResult
 
 _DEFAULT_THRESHOLD = 0.45
+_DEFAULT_RESULT_CACHE_SIZE = 1024
+_DEFAULT_CANDIDATE_CACHE_SIZE = 1024  # about 11 KiB per postcode
+
+# The sqlite3 module caches prepared statements per connection, keyed on
+# the SQL text. Keeping the hot queries as constants guarantees every
+# call hits that cache instead of re-parsing.
+#
+# Rows whose UPRN is empty or not all digits are filtered out in SQL, on
+# the indexed postcode subset, so they are never fetched or scored.
+# Each row is scored on line 1 and on the full address.
+_EPC_WHERE = f"FROM epc_addresses WHERE postcode = ? AND {VALID_UPRN_SQL}"
+_EPC_LOOKUP_SQL = (
+    f"SELECT CAST(uprn AS INTEGER), address1, {FULL_ADDRESS_SQL} "
+    f"{_EPC_WHERE}"
+)
+# Used when `ukgeolocate build-index` has stored normalised columns.
+_EPC_LOOKUP_PRENORM_SQL = (
+    f"SELECT CAST(uprn AS INTEGER), address1, {FULL_ADDRESS_SQL}, "
+    f"{', '.join(NORM_COLUMNS)} "
+    f"{_EPC_WHERE}"
+)
+_OS_SCHEMA = "osdb"  # the OS database, attached to the EPC connection
+_OS_LOOKUP_SQL = (
+    "SELECT X_COORDINATE, Y_COORDINATE, LATITUDE, LONGITUDE "
+    f"FROM {_OS_SCHEMA}.uprns WHERE UPRN = ?"
+)
+# find_coordinates_columns' names for the _OS_LOOKUP_SQL columns.
+_COORDINATE_COLUMNS = ("easting", "northing", "latitude", "longitude")
+_NAN = float("nan")
+
+
+def _collect_candidates(
+    rows: Iterable[tuple],
+) -> tuple[list[tuple[int, str]], list[str]]:
+    """
+    Flatten EPC rows into (owners, choices) for address.best_match.
+
+    Each row contributes its line 1 and full address to *choices*, so
+    choice i belongs to owners[i // 2], an (uprn, matched_address) pair.
+    Rows may carry the two prenormalised columns from build-index; any
+    that are NULL (e.g. rows added since the build) are normalised here.
+    """
+    owners: list[tuple[int, str]] = []
+    choices: list[str] = []
+    # Bypass the LRU cache: candidate rows rarely repeat, so caching them
+    # costs a miss per row and evicts the user queries it exists for.
+    normalise = address.normalise.__wrapped__
+    for uprn, addr1, addr_full, *norm in rows:
+        owners.append((uprn, addr_full or addr1 or ""))
+        norm1, norm_full = norm or (None, None)
+        choices.append(norm1 if norm1 is not None else normalise(addr1 or ""))
+        choices.append(
+            norm_full if norm_full is not None else normalise(addr_full or "")
+        )
+    return owners, choices
+
+
+def _strip_postcode(norm_query: str, norm_postcode: str) -> str:
+    """
+    Drop the postcode from the end of a normalised query, if present.
+
+    EPC addresses never include it, so a pasted full address otherwise
+    scores lower than the street address alone while making every
+    comparison longer. Either the spaced or unspaced form is removed
+    when it follows a space; a query that is only the postcode is kept.
+    """
+    for suffix in (norm_postcode, norm_postcode.replace(" ", "")):
+        cut = len(norm_query) - len(suffix) - 1  # the preceding space
+        if cut > 0 and norm_query[cut] == " " and norm_query.endswith(suffix):
+            return norm_query[:cut]
+    return norm_query
 
 
 class UKGeolocate:
@@ -20,6 +103,26 @@ class UKGeolocate:
     Initialise with paths to the two required SQLite databases.
     Validates that both databases exist and contain the expected
     tables on construction.
+
+    *mmap_size* and *cache_size* (bytes, per database) bound SQLite's
+    memory-mapped I/O window and page cache; lower them on small-RAM
+    hosts.
+
+    *epc_index* optionally names a flat index written by
+    index.build_flat_index; EPC candidates are then read from it
+    instead of SQLite, which is still used for validation and for the
+    coordinate lookup.
+
+    The last *result_cache_size* find_coordinates outcomes are memoised,
+    keyed on the normalised postcode and address, so repeated lookups
+    skip SQL and scoring. The candidate lists of the last
+    *candidate_cache_size* postcodes are kept too, so new addresses at a
+    recently seen postcode only pay for scoring. Call clear_cache()
+    after the databases change; 0 disables either cache.
+
+    *driver* "apsw" reads through APSW instead of the sqlite3 module,
+    whose thinner binding cuts per-query overhead; it needs the apsw
+    package.
     """
 
     def __init__(
@@ -27,11 +130,40 @@ class UKGeolocate:
         epc_db: str | Path,
         os_db: str | Path,
         match_threshold: float = _DEFAULT_THRESHOLD,
+        mmap_size: int = _DEFAULT_MMAP_SIZE,
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+        epc_index: Optional[str | Path] = None,
+        result_cache_size: int = _DEFAULT_RESULT_CACHE_SIZE,
+        candidate_cache_size: int = _DEFAULT_CANDIDATE_CACHE_SIZE,
+        driver: str = "sqlite3",
     ):
         self._threshold = match_threshold
-        self._epc_pool = _DatabasePool(Path(epc_db), "EPC")
-        self._os_pool = _DatabasePool(Path(os_db), "OS Open UPRN")
+        self._cached_find = lru_cache(maxsize=result_cache_size)(
+            self._uncached_find
+        )
+        self._cached_candidates = lru_cache(maxsize=candidate_cache_size)(
+            self._candidates
+        )
+        # One connection serves both files: the OS database is attached
+        # to the EPC one, sharing its lock and statement cache.
+        self._pool = _DatabasePool(
+            Path(epc_db), "EPC", mmap_size, cache_size, driver
+        )
+        self._pool.attach(_OS_SCHEMA, Path(os_db), "OS Open UPRN")
         self._validate_databases()
+        epc_columns = self._pool.columns("epc_addresses")
+        self._epc_sql = (
+            _EPC_LOOKUP_PRENORM_SQL
+            if epc_columns.issuperset(NORM_COLUMNS)
+            else _EPC_LOOKUP_SQL
+        )
+        try:
+            self._epc_index = (
+                _FlatIndex(Path(epc_index)) if epc_index is not None else None
+            )
+        except (DatabaseInvalid, DatabaseNotFound):
+            self._pool.close()
+            raise
 
     # ── Public API ────────────────────────────────────────────────
 
@@ -45,19 +177,86 @@ class UKGeolocate:
         Raises PostcodeInvalid, NoMatchFound, or DatabaseNotFound on failure.
         """
         pc = postcode.normalise(postcode_raw)
+        query = _strip_postcode(address.normalise(address_line), pc)
+        result = self._cached_find(pc, query)
+        if result is None:
+            raise NoMatchFound(pc, address_line)
+        return result
 
-        uprn, matched_address, score = self._lookup_uprn(pc, address_line)
-        x, y, lat, lon = self._lookup_coordinates(uprn, pc, address_line)
+    def find_coordinates_many(
+        self, pairs: Iterable[tuple[str, str]], workers: int = 1
+    ) -> list[Optional[LookupResult]]:
+        """
+        Resolve many (postcode, address_line) pairs in bulk.
 
-        return LookupResult(
-            uprn=uprn,
-            matched_address=matched_address,
-            match_score=score,
-            easting=x,
-            northing=y,
-            latitude=lat,
-            longitude=lon,
+        Pairs that share a postcode share a single candidate fetch, so
+        batches sorted or clustered by postcode do far less SQL and
+        normalisation work than a find_coordinates loop. With RapidFuzz
+        and NumPy installed, each postcode's queries are scored in one
+        batch; *workers* sets its thread count (-1 for every core).
+        Returns a list aligned with *pairs*, holding None wherever
+        find_coordinates would have raised PostcodeInvalid or
+        NoMatchFound.
+        Raises DatabaseNotFound if a database disappears.
+        """
+        pairs = list(pairs)
+        results: list[Optional[LookupResult]] = [None] * len(pairs)
+        for i, uprn, matched_address, score, row in self._bulk_matches(
+            pairs, workers
+        ):
+            results[i] = LookupResult(
+                uprn=uprn,
+                matched_address=matched_address,
+                match_score=score,
+                easting=row[0],
+                northing=row[1],
+                latitude=row[2],
+                longitude=row[3],
+            )
+        return results
+
+    def find_coordinates_columns(
+        self, pairs: Iterable[tuple[str, str]], workers: int = 1
+    ) -> dict:
+        """
+        find_coordinates_many, returned as columns rather than objects.
+
+        Holds one entry per matched pair, grouped by postcode in order
+        of first appearance; "index" gives each match's position in
+        *pairs*. "index" and "uprn" are array('q'), "matched_address" a
+        list, and "match_score" and the four coordinates array('d'),
+        with NaN for coordinates the OS database leaves NULL. Unboxed
+        columns take a fraction of the memory of LookupResult objects
+        and load into NumPy (numpy.frombuffer) without a copy.
+        Raises DatabaseNotFound if a database disappears.
+        """
+        columns: dict = {
+            "index": array("q"),
+            "uprn": array("q"),
+            "matched_address": [],
+            "match_score": array("d"),
+            "easting": array("d"),
+            "northing": array("d"),
+            "latitude": array("d"),
+            "longitude": array("d"),
+        }
+        index, uprns, addresses, scores = (
+            columns["index"],
+            columns["uprn"],
+            columns["matched_address"],
+            columns["match_score"],
         )
+        coords = tuple(columns[name] for name in _COORDINATE_COLUMNS)
+        for i, uprn, matched_address, score, row in self._bulk_matches(
+            list(pairs), workers
+        ):
+            index.append(i)
+            uprns.append(uprn)
+            addresses.append(matched_address)
+            scores.append(score)
+            for column, value in zip(coords, row):
+                column.append(_NAN if value is None else value)
+        return columns
 
     def health_check(self) -> dict:
         """
@@ -67,21 +266,34 @@ class UKGeolocate:
         """
         status: dict = {"healthy": True, "epc_db": "ok", "os_db": "ok"}
         try:
-            self._epc_pool.validate_tables(["epc_addresses"])
+            self._pool.validate_tables(["epc_addresses"])
         except Exception as exc:
             status["healthy"] = False
             status["epc_db"] = str(exc)
         try:
-            self._os_pool.validate_tables(["uprns"])
+            self._pool.validate_tables(["uprns"], _OS_SCHEMA)
         except Exception as exc:
             status["healthy"] = False
             status["os_db"] = str(exc)
         return status
 
+    def clear_cache(self) -> None:
+        """Forget memoised find_coordinates results and candidate lists."""
+        self._cached_find.cache_clear()
+        self._cached_candidates.cache_clear()
+
+    def cache_info(self) -> tuple:
+        """Return (hits, misses, maxsize, currsize) for the result cache."""
+        return self._cached_find.cache_info()
+
     def close(self) -> None:
-        """Close both database connection pools."""
-        self._epc_pool.close()
-        self._os_pool.close()
+        """Close the database connection and drop memoised inputs."""
+        self._pool.close()
+        if self._epc_index is not None:
+            self._epc_index.close()  # remapped on next use, like the pool
+        self.clear_cache()
+        postcode.normalise.cache_clear()
+        address.normalise.cache_clear()
 
     def __enter__(self) -> UKGeolocate:
         return self
@@ -93,57 +305,101 @@ class UKGeolocate:
 
     def _validate_databases(self) -> None:
         """Check both DB files exist and have the expected tables."""
-        self._epc_pool.validate_tables(["epc_addresses"])
-        self._os_pool.validate_tables(["uprns"])
+        self._pool.validate_tables(["epc_addresses"])
+        self._pool.validate_tables(["uprns"], _OS_SCHEMA)
+
+    def _bulk_matches(
+        self, pairs: list[tuple[str, str]], workers: int
+    ) -> Iterator[tuple[int, int, str, float, tuple]]:
+        """
+        Yield (position, uprn, matched_address, score, os_row) per match.
+
+        Shared by the bulk methods. Pairs that share a postcode share a
+        single candidate fetch and one best_matches call; pairs with an
+        invalid postcode, no match, or no OS coordinates are skipped.
+        """
+        # One batch validation up front, so invalid postcodes never
+        # reach normalise() and its raise-and-catch.
+        raw_postcodes = [postcode_raw for postcode_raw, _ in pairs]
+        wanted: dict[str, list[int]] = {}
+        for i, ok in enumerate(postcode.validate_batch(raw_postcodes)):
+            if ok:
+                pc = postcode.normalise(raw_postcodes[i])
+                wanted.setdefault(pc, []).append(i)
+
+        for pc, indices in wanted.items():
+            owners, choices = self._cached_candidates(pc)
+            queries = [
+                _strip_postcode(address.normalise(pairs[i][1]), pc)
+                for i in indices
+            ]
+            hits = address.best_matches(
+                queries, choices, self._threshold, workers
+            )
+            for i, hit in zip(indices, hits):
+                if hit is None:
+                    continue
+                index, score = hit
+                uprn, matched_address = owners[index // 2]
+                row = self._pool.fetchone(_OS_LOOKUP_SQL, (uprn,))
+                if row is None:
+                    continue  # no coordinates in the OS database
+                yield i, uprn, matched_address, score, row
+
+    def _uncached_find(
+        self, norm_postcode: str, norm_query: str
+    ) -> Optional[LookupResult]:
+        """find_coordinates on normalised inputs; None when nothing matches."""
+        try:
+            uprn, matched_address, score = self._lookup_uprn(
+                norm_postcode, norm_query
+            )
+            x, y, lat, lon = self._lookup_coordinates(
+                uprn, norm_postcode, norm_query
+            )
+        except NoMatchFound:
+            return None
+        return LookupResult(
+            uprn=uprn,
+            matched_address=matched_address,
+            match_score=score,
+            easting=x,
+            northing=y,
+            latitude=lat,
+            longitude=lon,
+        )
+
+    def _candidates(
+        self, norm_postcode: str
+    ) -> tuple[list[tuple[int, str]], list[str]]:
+        """
+        Fetch and flatten the EPC candidates for *norm_postcode*.
+
+        Call through _cached_candidates, whose callers share the returned
+        lists and must not mutate them.
+        """
+        if self._epc_index is not None:
+            return self._epc_index.candidates(norm_postcode)
+        rows = self._pool.fetchall(self._epc_sql, (norm_postcode,))
+        return _collect_candidates(rows)
 
     def _lookup_uprn(
-        self, norm_postcode: str, address_line: str
+        self, norm_postcode: str, norm_query: str
     ) -> tuple[int, str, float]:
         """
         Search the EPC database for the best UPRN matching *norm_postcode*
-        and *address_line*.
+        and the already-normalised address *norm_query*.
 
         Returns (uprn, matched_address, score).
         Raises NoMatchFound if no candidate exceeds the threshold.
         """
-        norm_query = address.normalise(address_line)
-
-        cur = self._epc_pool.execute(
-            "SELECT uprn, address1, address2, address3, address "
-            "FROM epc_addresses "
-            "WHERE postcode = ? AND uprn IS NOT NULL AND uprn != ''",
-            (norm_postcode,),
-        )
-
-        best: Optional[tuple[int, str, float]] = None
-
-        for uprn_str, addr1, addr2, addr3, addr_full in cur:
-            # Score against every address column; keep the highest
-            row_score = max(
-                address.similarity(addr1 or "", norm_query),
-                address.similarity(addr2 or "", norm_query),
-                address.similarity(addr3 or "", norm_query),
-                address.similarity(addr_full or "", norm_query),
-            )
-            if row_score >= self._threshold and (
-                best is None or row_score > best[2]
-            ):
-                try:
-                    uprn_int = int(uprn_str)
-                except (ValueError, TypeError):
-                    continue
-                best = (
-                    uprn_int,
-                    addr_full or addr1 or "",
-                    row_score,
-                )
-                # Perfect match — no need to keep scanning
-                if row_score == 1.0:
-                    break
-
-        if best is None:
-            raise NoMatchFound(norm_postcode, address_line)
-        return best
+        owners, choices = self._cached_candidates(norm_postcode)
+        hit = address.best_match(norm_query, choices, self._threshold)
+        if hit is None:
+            raise NoMatchFound(norm_postcode, norm_query)
+        index, score = hit
+        uprn, matched_address = owners[index // 2]
+        return uprn, matched_address, score
 
     def _lookup_coordinates(
         self, uprn: int, postcode_for_error: str, address_for_error: str
@@ -153,12 +409,7 @@ class UKGeolocate:
 
         Raises NoMatchFound if the UPRN is not in the OS database.
         """
-        cur = self._os_pool.execute(
-            "SELECT X_COORDINATE, Y_COORDINATE, LATITUDE, LONGITUDE "
-            "FROM uprns WHERE UPRN = ?",
-            (uprn,),
-        )
-        row = cur.fetchone()
+        row = self._pool.fetchone(_OS_LOOKUP_SQL, (uprn,))
         if row is None:
             raise NoMatchFound(postcode_for_error, address_for_error)
         return (row[0], row[1], row[2], row[3])
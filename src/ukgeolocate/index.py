@@ -0,0 +1,159 @@
+"""One-off preparation of the EPC database for faster lookups."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sqlite3
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from ukgeolocate import _flat, address
+from ukgeolocate._db import _BUSY_TIMEOUT
+from ukgeolocate.exceptions import DatabaseInvalid, DatabaseNotFound
+
+# Precomputed address.normalise() output for the two columns the client
+# scores. When present, lookups only normalise the user's query.
+NORM_COLUMNS = ("addr1_norm", "addr_norm")
+
+# The full address as the client scores it: the address column, rebuilt
+# from the component lines when that is empty.
+FULL_ADDRESS_SQL = (
+    "COALESCE(NULLIF(address, ''), TRIM(COALESCE(address1, '') || ' ' || "
+    "COALESCE(address2, '') || ' ' || COALESCE(address3, '')))"
+)
+
+# Rows whose UPRN is empty or not all digits can never be returned.
+VALID_UPRN_SQL = "uprn != '' AND uprn NOT GLOB '*[^0-9]*'"
+
+
+def build_index(epc_db: str | Path) -> int:
+    """
+    Add and populate normalised address columns in the EPC database.
+
+    Also creates the postcode index every lookup probes, unless an index
+    led by postcode already exists. Safe to re-run; existing values are
+    recomputed. Opens the file for writing, so run it once after
+    downloading the database rather than alongside live lookups.
+    Returns the number of rows processed. SQLite failures, such as the
+    file being locked or read-only, are raised as DatabaseInvalid.
+    """
+    path = Path(epc_db)
+    if not path.is_file():
+        raise DatabaseNotFound(str(path), "EPC")
+
+    conn = sqlite3.connect(str(path), timeout=_BUSY_TIMEOUT)
+    try:
+        existing = {
+            row[1] for row in conn.execute("PRAGMA table_info(epc_addresses)")
+        }
+        if not existing:
+            raise DatabaseInvalid(str(path), "missing tables: epc_addresses")
+
+        # Use the undecorated function: a build touches every row once,
+        # so the LRU cache would only add overhead.
+        conn.create_function(
+            "ukg_normalise", 1, address.normalise.__wrapped__,
+            deterministic=True,
+        )
+        with conn:
+            for column in NORM_COLUMNS:
+                if column not in existing:
+                    conn.execute(
+                        f"ALTER TABLE epc_addresses ADD COLUMN {column} TEXT"
+                    )
+            cur = conn.execute(
+                "UPDATE epc_addresses SET "
+                "addr1_norm = ukg_normalise(COALESCE(address1, '')), "
+                f"addr_norm = ukg_normalise({FULL_ADDRESS_SQL})"
+            )
+            if not _has_postcode_index(conn):
+                conn.execute(
+                    "CREATE INDEX idx_epc_postcode ON epc_addresses (postcode)"
+                )
+        return cur.rowcount
+    except sqlite3.Error as exc:
+        raise DatabaseInvalid(str(path), str(exc)) from exc
+    finally:
+        conn.close()
+
+
+def _has_postcode_index(conn: sqlite3.Connection) -> bool:
+    """True if some index on epc_addresses has postcode as its first column."""
+    for _, name, *_ in conn.execute("PRAGMA index_list(epc_addresses)"):
+        first = conn.execute(f"PRAGMA index_info('{name}')").fetchone()
+        if first is not None and first[2] == "postcode":
+            return True
+    return False
+
+
+def build_flat_index(
+    epc_db: str | Path, out_path: Optional[str | Path] = None
+) -> Path:
+    """
+    Write a memory-mappable snapshot of the EPC candidates.
+
+    Pass the result to UKGeolocate(epc_index=...) to serve candidate
+    lookups without SQLite. Defaults to *epc_db* with an added '.idx'
+    suffix; the file is replaced atomically. Rebuild it whenever the
+    EPC database changes. Returns the path written.
+    """
+    path = Path(epc_db)
+    if not path.is_file():
+        raise DatabaseNotFound(str(path), "EPC")
+    out = Path(out_path) if out_path is not None else Path(f"{path}.idx")
+    tmp = out.with_name(out.name + ".tmp")
+
+    normalise = address.normalise.__wrapped__
+    conn = sqlite3.connect(
+        f"file:{path}?mode=ro", uri=True, timeout=_BUSY_TIMEOUT
+    )
+    try:
+        rows = conn.execute(
+            f"SELECT postcode, CAST(uprn AS INTEGER), address1, "
+            f"{FULL_ADDRESS_SQL} FROM epc_addresses "
+            f"WHERE postcode IS NOT NULL AND {VALID_UPRN_SQL} "
+            "ORDER BY postcode"
+        )
+
+        entries = []
+        with open(tmp, "wb") as f:
+            f.write(_flat.HEADER.pack(_flat.MAGIC, 0, 0))
+            for pc, group in itertools.groupby(rows, key=lambda r: r[0]):
+                if len(pc) > _flat.KEY_WIDTH or not pc.isascii():
+                    continue  # can never equal a normalised postcode
+                uprns = array("q")
+                displays = []
+                choices = []
+                for _, uprn, addr1, addr_full in group:
+                    uprns.append(uprn)
+                    displays.append(addr_full or addr1 or "")
+                    choices.append(normalise(addr1 or ""))
+                    choices.append(normalise(addr_full or ""))
+                if sys.byteorder == "big":
+                    uprns.byteswap()
+                text = _flat.FIELD_SEP.join(
+                    field.replace(_flat.FIELD_SEP, " ")
+                    for field in displays + choices
+                ).encode("utf-8")
+                key = _flat.postcode_key(pc)
+                entries.append((key, f.tell(), len(uprns), len(text)))
+                f.write(uprns.tobytes())
+                f.write(text)
+
+            entries.sort()
+            directory = f.tell()
+            for entry in entries:
+                f.write(_flat.ENTRY.pack(*entry))
+            f.seek(0)
+            f.write(_flat.HEADER.pack(_flat.MAGIC, directory, len(entries)))
+        os.replace(tmp, out)
+    except sqlite3.Error as exc:
+        raise DatabaseInvalid(str(path), str(exc)) from exc
+    finally:
+        conn.close()
+        if tmp.exists():
+            tmp.unlink()
+    return out
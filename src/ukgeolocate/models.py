@@ -2,11 +2,26 @@
 
 from dataclasses import dataclass
 
+_FIELDS = (
+    "uprn",
+    "matched_address",
+    "match_score",
+    "easting",
+    "northing",
+    "latitude",
+    "longitude",
+)
+
 
 @dataclass(frozen=True)
 class LookupResult:
     """Complete result of a postcode + address -> coordinate lookup."""
 
+    # Declared by hand rather than with dataclass(slots=True), which
+    # needs Python 3.10. Drops the per-instance __dict__. _dict is not a
+    # field: it memoises to_dict() and stays unset until first needed.
+    __slots__ = _FIELDS + ("_dict",)
+
     uprn: int
     matched_address: str
     match_score: float       # 0.0-1.0 similarity confidence
@@ -16,13 +31,33 @@ class LookupResult:
     longitude: float         # WGS84
 
     def to_dict(self) -> dict:
-        """Convert to a plain dictionary (useful for JSON serialisation)."""
-        return {
-            "uprn": self.uprn,
-            "matched_address": self.matched_address,
-            "match_score": round(self.match_score, 3),
-            "easting": self.easting,
-            "northing": self.northing,
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-        }
+        """
+        Convert to a plain dictionary (useful for JSON serialisation).
+
+        The dict is built once per result and a fresh copy returned each
+        call, so cached results that are serialised repeatedly skip the
+        rebuild and callers may still modify what they get.
+        """
+        try:
+            cached = self._dict
+        except AttributeError:
+            cached = {
+                "uprn": self.uprn,
+                "matched_address": self.matched_address,
+                "match_score": round(self.match_score, 3),
+                "easting": self.easting,
+                "northing": self.northing,
+                "latitude": self.latitude,
+                "longitude": self.longitude,
+            }
+            object.__setattr__(self, "_dict", cached)
+        return cached.copy()
+
+    # Frozen instances reject setattr, which default unpickling of a
+    # slotted class relies on. Only the fields travel; the memo does not.
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in _FIELDS)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(_FIELDS, state):
+            object.__setattr__(self, name, value)
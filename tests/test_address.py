@@ -1,6 +1,40 @@
 """Tests for ukgeolocate.address module."""
 
-from ukgeolocate.address import normalise, similarity
+import pytest
+
+from ukgeolocate.address import best_match, best_matches, normalise, similarity
+
+
+def _lcs_ratio(a: str, b: str) -> float:
+    """Reference Indel similarity via the textbook LCS table."""
+    prev = [0] * (len(b) + 1)
+    for ca in a:
+        cur = [0]
+        for j, cb in enumerate(b):
+            cur.append(prev[j] + 1 if ca == cb else max(prev[j + 1], cur[j]))
+        prev = cur
+    return 2 * prev[-1] / (len(a) + len(b)) if a or b else 1.0
+
+
+LCS_CASES = [
+    ("10 DOWNING STREET LONDON", "10 DOWNING ST LONDON"),
+    ("10 DOWNING STREET", "99 BUCKINGHAM PALACE ROAD"),
+    ("FLAT A 1 EXAMPLE ROAD", "1 EXAMPLE ROAD FLAT A"),
+    ("", ""),
+    ("CAFÉ ROYAL", "CAFE ROYAL"),
+    ("THE OLD RECTORY CHURCH LANE LITTLE SNORING FAKENHAM NORFOLK", "OLD RECTORY"),
+]
+
+
+@pytest.fixture()
+def bitparallel_address(monkeypatch):
+    """The address module with only the pure-Python backend available."""
+    from ukgeolocate import address
+
+    monkeypatch.setattr(address, "Indel", None)
+    monkeypatch.setattr(address, "process", None)
+    monkeypatch.setattr(address, "_jit", None)
+    return address
 
 
 class TestNormalise:
@@ -35,3 +69,146 @@ class TestSimilarity:
     def test_completely_different(self):
         score = similarity("10 DOWNING STREET", "99 BUCKINGHAM PALACE ROAD")
         assert score < 0.4
+
+    def test_flat_prefix_is_not_a_perfect_match(self):
+        # A token-subset scorer would call these identical (1.0)
+        assert similarity("FLAT 2 10 DOWNING STREET", "10 DOWNING STREET") < 0.9
+
+    def test_below_cutoff_reported_as_zero(self):
+        assert similarity("10 DOWNING STREET", "99 BUCKINGHAM PALACE ROAD", 0.9) == 0.0
+
+    def test_cutoff_keeps_good_scores(self):
+        assert similarity("10 Downing Street", "10 DOWNING STREET", 0.9) == 1.0
+
+    def test_pure_python_fallback(self, bitparallel_address):
+        address = bitparallel_address
+        assert address.similarity("10 Downing Street", "10 DOWNING STREET") == 1.0
+        assert address.similarity("10 DOWNING", "99 BUCKINGHAM PALACE", 0.9) == 0.0
+
+
+class TestBestMatch:
+    CHOICES = ["11 DOWNING STREET", "10 DOWNING STREET", "10 DOWNING STREET"]
+
+    def test_returns_index_and_score(self):
+        assert best_match("10 DOWNING STREET", self.CHOICES) == (1, 1.0)
+
+    def test_nothing_above_cutoff(self):
+        assert best_match("99 BUCKINGHAM PALACE ROAD", self.CHOICES, 0.9) is None
+
+    def test_empty_candidates(self):
+        assert best_match("10 DOWNING STREET", []) is None
+
+    def test_pure_python_fallback_matches(self, bitparallel_address):
+        address = bitparallel_address
+        assert address.best_match("10 DOWNING STREET", self.CHOICES) == (1, 1.0)
+        assert address.best_match("XYZZY", self.CHOICES, 0.9) is None
+
+    def test_pure_python_fallback_first_on_ties(self, bitparallel_address):
+        address = bitparallel_address
+        choices = ["XX", "10 DOWNING STREET", "11 DOWNING ROAD", "10 DOWNING STREET"]
+        index, score = address.best_match("10 DOWNING ST", choices)
+        assert index == 1
+        assert score == pytest.approx(_lcs_ratio(choices[1], "10 DOWNING ST"))
+
+
+class TestBestMatches:
+    CHOICES = ["11 DOWNING STREET", "10 DOWNING STREET", "10 DOWNING STREET", "X"]
+    QUERIES = ["10 DOWNING STREET", "11 DOWNING ST", "XYZZY", "10 DOWNING"]
+
+    def test_agrees_with_best_match(self):
+        expected = [best_match(q, self.CHOICES, 0.5) for q in self.QUERIES]
+        assert best_matches(self.QUERIES, self.CHOICES, 0.5) == expected
+        assert best_matches(self.QUERIES, self.CHOICES, 0.5, workers=-1) == expected
+
+    def test_empty_inputs(self):
+        assert best_matches([], self.CHOICES) == []
+        assert best_matches(self.QUERIES, []) == [None] * len(self.QUERIES)
+
+    def test_fallback_without_numpy(self, monkeypatch):
+        from ukgeolocate import address
+
+        expected = [best_match(q, self.CHOICES, 0.5) for q in self.QUERIES]
+        monkeypatch.setattr(address, "np", None)
+        assert address.best_matches(self.QUERIES, self.CHOICES, 0.5) == expected
+
+
+class TestBitParallelBackend:
+    @pytest.mark.parametrize(("a", "b"), LCS_CASES)
+    def test_matches_lcs_ratio(self, a: str, b: str):
+        from ukgeolocate import _bitparallel
+
+        assert _bitparallel.indel_ratio(a, b) == pytest.approx(_lcs_ratio(a, b))
+        assert _bitparallel.indel_ratio(b, a) == pytest.approx(_lcs_ratio(a, b))
+
+    def test_best_match_empty_and_blank_candidates(self, bitparallel_address):
+        address = bitparallel_address
+        assert address.best_match("", ["X", ""]) == (1, 1.0)
+        assert address.best_match("10 DOWNING STREET", ["", "", "10 DOWNING STREET"]) == (2, 1.0)
+
+
+class TestJitBackend:
+    @pytest.fixture()
+    def address(self, monkeypatch):
+        pytest.importorskip("numba")
+        from ukgeolocate import _jit, address
+
+        monkeypatch.setattr(address, "Indel", None)
+        monkeypatch.setattr(address, "process", None)
+        monkeypatch.setattr(address, "_jit", _jit)
+        return address
+
+    @pytest.mark.parametrize(("a", "b"), LCS_CASES)
+    def test_kernel_matches_lcs_ratio(self, address, a: str, b: str):
+        assert address.similarity(a, b) == pytest.approx(_lcs_ratio(a, b))
+
+    def test_best_match(self, address):
+        choices = ["XX", "10 DOWNING STREET", "11 DOWNING ROAD", "10 DOWNING STREET"]
+        index, score = address.best_match("10 DOWNING ST", choices)
+        assert index == 1
+        assert score == pytest.approx(_lcs_ratio(choices[1], "10 DOWNING ST"))
+        assert address.best_match("XYZZY", choices, 0.9) is None
+        assert address.best_match("10 DOWNING STREET", choices) == (1, 1.0)
+
+    def test_lone_surrogates(self, address):
+        a, b = "10 DOWNING\udcff STREET", "10 DOWNING STREET\ud800"
+        assert address.similarity(a, b) == pytest.approx(_lcs_ratio(a, b))
+        index, score = address.best_match(a, ["XX", b])
+        assert index == 1
+        assert score == pytest.approx(_lcs_ratio(a, b))
+        assert address.best_matches([a, b], [b]) == [(0, score), (0, 1.0)]
+
+    def test_best_match_empty_and_blank_candidates(self, address):
+        assert address.best_match("10 DOWNING STREET", []) is None
+        assert address.best_match("10 DOWNING STREET", ["", "", "10 DOWNING STREET"]) == (2, 1.0)
+
+
+class TestScoreOnCutoff:
+    # The true score of this pair is exactly 0.3 (2 * 3 / 20)
+    CANDIDATE = "B FEB2 CBÉ AE"
+    QUERY = "2C 2FDÉ"
+
+    @pytest.fixture(params=["rapidfuzz", "jit", "bitparallel"])
+    def address(self, request, monkeypatch):
+        from ukgeolocate import address
+
+        if request.param == "rapidfuzz":
+            pytest.importorskip("rapidfuzz")
+            return address
+        if request.param == "bitparallel":
+            return request.getfixturevalue("bitparallel_address")
+        pytest.importorskip("numba")
+        from ukgeolocate import _jit
+
+        monkeypatch.setattr(address, "Indel", None)
+        monkeypatch.setattr(address, "process", None)
+        monkeypatch.setattr(address, "_jit", _jit)
+        return address
+
+    def test_score_on_cutoff_is_kept(self, address):
+        assert address.similarity(self.CANDIDATE, self.QUERY, 0.3) == 0.3
+        assert address.best_match(self.QUERY, [self.CANDIDATE], 0.3) == (0, 0.3)
+        assert address.best_matches([self.QUERY] * 2, [self.CANDIDATE], 0.3) == [(0, 0.3)] * 2
+
+    def test_score_below_cutoff_is_dropped(self, address):
+        assert address.similarity(self.CANDIDATE, self.QUERY, 0.3000001) == 0.0
+        assert address.best_match(self.QUERY, [self.CANDIDATE], 0.3000001) is None
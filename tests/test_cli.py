@@ -0,0 +1,21 @@
+"""Tests for ukgeolocate.cli module."""
+
+from pathlib import Path
+
+from ukgeolocate import UKGeolocate, cli
+
+
+class TestInteractive:
+    def test_renders_result_box(
+        self, tmp_epc_db: Path, tmp_os_db: Path, monkeypatch, capsys
+    ):
+        answers = iter(["SW1A 2AA", "10 Downing Street", "q"])
+        monkeypatch.setattr("builtins.input", lambda _: next(answers))
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as client:
+            cli._run_interactive(client)
+        lines = capsys.readouterr().out.splitlines()
+        assert "  │  UPRN              100023336956                       │" in lines
+        assert "  │  Match Confidence  100%                               │" in lines
+        box = [line for line in lines if line.startswith("  │")]
+        assert len(box) == 7
+        assert len({len(line) for line in box}) == 1
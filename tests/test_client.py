@@ -1,5 +1,7 @@
 """Tests for ukgeolocate.client module."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -33,6 +35,17 @@ class TestFindCoordinates:
         assert result.uprn == 300000000001
         assert result.latitude == 53.4808
 
+    def test_trailing_postcode_ignored(self, client: UKGeolocate):
+        expected = client.find_coordinates("SW1A 2AA", "10 Downing Street, London")
+        for line in ("10 Downing Street, London, SW1A 2AA", "10 Downing St London sw1a2aa"):
+            result = client.find_coordinates("sw1a2aa", line)
+            assert result.uprn == expected.uprn
+        assert result.match_score == client.find_coordinates(
+            "SW1A 2AA", "10 Downing St London"
+        ).match_score
+        many = client.find_coordinates_many([("SW1A 2AA", "10 Downing Street, London, SW1A 2AA")])
+        assert many == [expected]
+
     def test_invalid_postcode_raises(self, client: UKGeolocate):
         with pytest.raises(PostcodeInvalid):
             client.find_coordinates("INVALID", "10 Downing Street")
@@ -46,6 +59,100 @@ class TestFindCoordinates:
         result = client.find_coordinates("SW1A 2AA", "10 Downing Street")
         assert result.uprn == 100023336956
 
+    def test_bad_uprn_row_never_matched(self, client: UKGeolocate):
+        # lmk005 is the only exact match, but its UPRN is filtered in SQL
+        result = client.find_coordinates("SW1A 2AA", "12 Downing Street")
+        assert result.uprn in (100023336956, 100023336957)
+        owners, _ = client._candidates("SW1A 2AA")
+        assert [uprn for uprn, _ in owners] == [100023336956, 100023336957]
+
+    def test_missing_full_address_rebuilt_from_lines(
+        self, tmp_epc_db: Path, tmp_os_db: Path
+    ):
+        import sqlite3
+
+        conn = sqlite3.connect(str(tmp_epc_db))
+        conn.execute(
+            "UPDATE epc_addresses SET address = NULL WHERE lmk_key = 'lmk003'"
+        )
+        conn.commit()
+        conn.close()
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            result = c.find_coordinates("EC1A 1BB", "1 Example Road Flat A")
+        assert result.uprn == 200000000001
+        assert result.matched_address == "1 EXAMPLE ROAD FLAT A"
+
+
+class TestFindCoordinatesMany:
+    def test_matches_single_lookups(self, client: UKGeolocate):
+        pairs = [
+            ("SW1A 2AA", "10 Downing Street"),
+            ("m11ae", "50 High Street"),
+            ("SW1A 2AA", "11 Downing Street"),
+        ]
+        results = client.find_coordinates_many(pairs)
+        assert results == [client.find_coordinates(*p) for p in pairs]
+
+    def test_failures_are_none(self, client: UKGeolocate):
+        results = client.find_coordinates_many(
+            [
+                ("INVALID", "10 Downing Street"),
+                ("SW1A 2AA", "ZZZZZ COMPLETELY UNRELATED XYZZY"),
+                ("EC1A 1BB", "Flat A, 1 Example Road"),
+            ]
+        )
+        assert results[:2] == [None, None]
+        assert results[2].uprn == 200000000001
+
+    def test_missing_coordinates_is_none(self, tmp_epc_db: Path, tmp_os_db: Path):
+        import sqlite3
+
+        conn = sqlite3.connect(str(tmp_epc_db))
+        conn.execute(
+            "INSERT INTO epc_addresses VALUES "
+            "('lmk006', 'M1 1AE', '52 HIGH STREET', '', '', "
+            "'52, HIGH STREET, MANCHESTER', '999999999999')"
+        )
+        conn.commit()
+        conn.close()
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            assert c.find_coordinates_many([("M1 1AE", "52 High Street")]) == [None]
+            with pytest.raises(NoMatchFound):
+                c.find_coordinates("M1 1AE", "52 High Street")
+
+    def test_accepts_generator_and_empty(self, client: UKGeolocate):
+        assert client.find_coordinates_many(iter([])) == []
+        gen = (("M1 1AE", a) for a in ["50 High Street"])
+        assert client.find_coordinates_many(gen)[0].uprn == 300000000001
+
+
+class TestFindCoordinatesColumns:
+    PAIRS = [
+        ("SW1A 2AA", "10 Downing Street"),
+        ("INVALID", "10 Downing Street"),
+        ("M1 1AE", "50 High Street"),
+        ("SW1A 2AA", "ZZZZZ COMPLETELY UNRELATED XYZZY"),
+        ("sw1a2aa", "11 Downing Street"),
+    ]
+
+    def test_columns_match_find_coordinates_many(self, client: UKGeolocate):
+        from array import array
+
+        columns = client.find_coordinates_columns(self.PAIRS)
+        many = client.find_coordinates_many(self.PAIRS)
+        assert sorted(columns["index"]) == [i for i, r in enumerate(many) if r]
+        assert isinstance(columns["uprn"], array)
+        assert isinstance(columns["latitude"], array)
+        for row, i in enumerate(columns["index"]):
+            expected = many[i].to_dict()
+            got = {name: columns[name][row] for name in expected}
+            got["match_score"] = round(got["match_score"], 3)
+            assert got == expected
+
+    def test_empty(self, client: UKGeolocate):
+        columns = client.find_coordinates_columns([])
+        assert all(len(column) == 0 for column in columns.values())
+
 
 class TestHealthCheck:
     def test_healthy(self, client: UKGeolocate):
@@ -73,6 +180,39 @@ class TestHealthCheck:
                 epc_db=tmp_path / "nonexistent.db", os_db=os_db
             )
 
+    def test_os_db_deleted_mid_session(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            tmp_os_db.unlink()
+            status = c.health_check()
+            assert status["healthy"] is False
+            assert status["epc_db"] == "ok"
+            assert "OS Open UPRN" in status["os_db"]
+            c.close()
+            with pytest.raises(DatabaseNotFound) as exc_info:
+                c.find_coordinates("SW1A 2AA", "10 Downing Street")
+            assert exc_info.value.db_name == "OS Open UPRN"
+
+    def test_os_db_deleted_after_close(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            c.close()
+            tmp_os_db.unlink()
+            status = c.health_check()
+            assert status["healthy"] is False
+            assert status["epc_db"] == "ok"
+            assert "OS Open UPRN" in status["os_db"]
+            with pytest.raises(DatabaseNotFound) as exc_info:
+                c.find_coordinates("SW1A 2AA", "10 Downing Street")
+            assert exc_info.value.db_name == "OS Open UPRN"
+
+    def test_os_db_restored_after_close(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            c.close()
+            moved = tmp_os_db.rename(tmp_os_db.with_suffix(".bak"))
+            assert c.health_check()["healthy"] is False
+            moved.rename(tmp_os_db)
+            assert c.health_check()["healthy"] is True
+            assert c.find_coordinates("M1 1AE", "50 High Street").uprn == 300000000001
+
 
 class TestContextManager:
     def test_context_manager_closes(self, tmp_epc_db: Path, tmp_os_db: Path):
@@ -80,8 +220,176 @@ class TestContextManager:
             result = c.find_coordinates("SW1A 2AA", "10 Downing Street")
             assert result.uprn == 100023336956
         # After exiting, pools should be closed
-        assert c._epc_pool._conn is None
-        assert c._os_pool._conn is None
+        assert c._pool._conn is None
+
+    def test_close_clears_normalise_caches(self, tmp_epc_db: Path, tmp_os_db: Path):
+        from ukgeolocate import address, postcode
+
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            c.find_coordinates("SW1A 2AA", "10 Downing Street")
+            assert postcode.normalise.cache_info().currsize > 0
+            assert address.normalise.cache_info().currsize > 0
+        assert postcode.normalise.cache_info().currsize == 0
+        assert address.normalise.cache_info().currsize == 0
+
+    def test_candidates_bypass_normalise_cache(self, client: UKGeolocate):
+        from ukgeolocate import address
+
+        address.normalise.cache_clear()
+        client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        assert address.normalise.cache_info().currsize == 1  # the query only
+
+
+class TestResultCache:
+    def test_equivalent_spellings_hit_cache(self, client: UKGeolocate):
+        first = client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        again = client.find_coordinates("sw1a2aa", "10,  downing street")
+        assert again is first
+        info = client.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_no_match_reports_raw_address(self, client: UKGeolocate):
+        for _ in range(2):
+            with pytest.raises(NoMatchFound) as exc_info:
+                client.find_coordinates("SW1A 2AA", "Buckingham, Palace")
+            assert exc_info.value.address == "Buckingham, Palace"
+        assert client.cache_info().hits == 1
+
+    def test_clear_cache(self, client: UKGeolocate):
+        client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        client.clear_cache()
+        assert client.cache_info().currsize == 0
+
+    def test_candidates_shared_across_addresses(self, client: UKGeolocate):
+        client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        client.find_coordinates("SW1A 2AA", "11 Downing Street")
+        info = client._cached_candidates.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        client.clear_cache()
+        assert client._cached_candidates.cache_info().currsize == 0
+
+    def test_disabled(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(
+            epc_db=tmp_epc_db,
+            os_db=tmp_os_db,
+            result_cache_size=0,
+            candidate_cache_size=0,
+        ) as c:
+            c.find_coordinates("SW1A 2AA", "10 Downing Street")
+            c.find_coordinates("SW1A 2AA", "10 Downing Street")
+            assert c.cache_info().hits == 0
+            assert c._cached_candidates.cache_info().hits == 0
+
+
+class TestConnectionTuning:
+    def test_default_pragmas(self, client: UKGeolocate):
+        conn = client._pool.get_connection()
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_overrides(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, mmap_size=0, cache_size=1024 * 1024
+        ) as c:
+            conn = c._pool.get_connection()
+            for schema in ("main", "osdb"):
+                assert conn.execute(f"PRAGMA {schema}.mmap_size").fetchone()[0] == 0
+                assert conn.execute(f"PRAGMA {schema}.cache_size").fetchone()[0] == -1024
+            assert c.find_coordinates("M1 1AE", "50 High Street").uprn == 300000000001
+
+    def test_single_connection_attaches_os_db(
+        self, client: UKGeolocate, tmp_os_db: Path
+    ):
+        conn = client._pool.get_connection()
+        attached = {row[1]: row[2] for row in conn.execute("PRAGMA database_list")}
+        assert Path(attached["osdb"]) == tmp_os_db
+
+    def test_busy_timeout(self, client: UKGeolocate):
+        conn = client._pool.get_connection()
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+class TestApswDriver:
+    PAIRS = [
+        ("SW1A 2AA", "10 Downing Street"),
+        ("EC1A 1BB", "Flat A 1 Example Road"),
+        ("M1 1AE", "50 High Street"),
+    ]
+
+    @pytest.fixture()
+    def apsw_client(self, tmp_epc_db: Path, tmp_os_db: Path):
+        pytest.importorskip("apsw")
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db, driver="apsw") as c:
+            yield c
+
+    def test_same_results_as_sqlite3(self, client: UKGeolocate, apsw_client):
+        assert apsw_client.find_coordinates_many(self.PAIRS) == [
+            client.find_coordinates(*p) for p in self.PAIRS
+        ]
+        assert apsw_client.health_check()["healthy"] is True
+
+    def test_pragmas_applied(self, apsw_client):
+        conn = apsw_client._pool.get_connection()
+        for schema in ("main", "osdb"):
+            assert conn.execute(f"PRAGMA {schema}.cache_size").fetchone()[0] == -65536
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_os_db_deleted_mid_session(self, apsw_client, tmp_os_db: Path):
+        apsw_client.close()
+        tmp_os_db.unlink()
+        with pytest.raises(DatabaseNotFound) as exc_info:
+            apsw_client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        assert exc_info.value.db_name == "OS Open UPRN"
+
+    def test_unknown_driver(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with pytest.raises(ValueError):
+            UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db, driver="odbc")
+
+
+class TestThreadSafety:
+    def test_shared_client_across_threads(self, tmp_epc_db: Path, tmp_os_db: Path):
+        pairs = [
+            ("SW1A 2AA", "10 Downing Street"),
+            ("SW1A 2AA", "11 Downing St"),
+            ("EC1A 1BB", "Flat A 1 Example Road"),
+            ("M1 1AE", "50 High Street"),
+        ] * 50
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, result_cache_size=0
+        ) as c:
+            expected = [c.find_coordinates(*p) for p in pairs]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                got = list(pool.map(lambda p: c.find_coordinates(*p), pairs))
+        assert got == expected
+
+    def test_shared_client_across_threads_jit_backend(
+        self, tmp_epc_db: Path, tmp_os_db: Path
+    ):
+        # Numba's workqueue layer aborts the process on concurrent
+        # parallel launches, so run in a child with RapidFuzz blocked.
+        import subprocess
+        import sys
+
+        pytest.importorskip("numba")
+        script = f"""
+import sys
+sys.modules["rapidfuzz"] = None
+from concurrent.futures import ThreadPoolExecutor
+from ukgeolocate import UKGeolocate, address
+assert address._jit is not None
+pairs = [("SW1A 2AA", "10 Downing St"), ("M1 1AE", "50 High Street")] * 200
+with UKGeolocate({str(tmp_epc_db)!r}, {str(tmp_os_db)!r}, result_cache_size=0) as c:
+    expected = [c.find_coordinates(*p) for p in pairs]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        got = list(pool.map(lambda p: c.find_coordinates(*p), pairs))
+assert got == expected
+"""
+        env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+        proc = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True
+        )
+        assert proc.returncode == 0, proc.stderr
 
 
 class TestDatabaseNotFound:
@@ -118,3 +426,16 @@ class TestLookupResultToDict:
             "longitude",
         }
         assert set(result.to_dict().keys()) == expected_keys
+
+    def test_to_dict_returns_independent_copies(self, client: UKGeolocate):
+        result = client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        first = result.to_dict()
+        first["uprn"] = None
+        assert result.to_dict()["uprn"] == 100023336956
+
+    def test_slotted_and_picklable(self, client: UKGeolocate):
+        import pickle
+
+        result = client.find_coordinates("SW1A 2AA", "10 Downing Street")
+        assert not hasattr(result, "__dict__")
+        assert pickle.loads(pickle.dumps(result)) == result
@@ -0,0 +1,247 @@
+"""Tests for ukgeolocate.index module."""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ukgeolocate import UKGeolocate, postcode
+from ukgeolocate.address import normalise
+from ukgeolocate.exceptions import DatabaseInvalid, DatabaseNotFound, NoMatchFound
+from ukgeolocate.index import NORM_COLUMNS, build_flat_index, build_index
+
+
+class TestBuildIndex:
+    def test_populates_normalised_columns(self, tmp_epc_db: Path):
+        assert build_index(tmp_epc_db) == 5
+        conn = sqlite3.connect(str(tmp_epc_db))
+        rows = conn.execute(
+            "SELECT address1, address, addr1_norm, addr_norm FROM epc_addresses"
+        ).fetchall()
+        conn.close()
+        for addr1, addr_full, norm1, norm_full in rows:
+            assert norm1 == normalise(addr1)
+            assert norm_full == normalise(addr_full)
+
+    def test_rerun_is_safe(self, tmp_epc_db: Path):
+        build_index(tmp_epc_db)
+        assert build_index(tmp_epc_db) == 5
+
+    def test_creates_missing_postcode_index(self, tmp_epc_db: Path):
+        conn = sqlite3.connect(str(tmp_epc_db))
+        conn.execute("DROP INDEX idx_epc_postcode")
+        conn.commit()
+        conn.close()
+        build_index(tmp_epc_db)
+        conn = sqlite3.connect(str(tmp_epc_db))
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM epc_addresses WHERE postcode = ?",
+            ("SW1A 2AA",),
+        ).fetchall()
+        conn.close()
+        assert "USING INDEX idx_epc_postcode" in plan[0][-1]
+
+    def test_keeps_existing_postcode_index(self, tmp_epc_db: Path):
+        conn = sqlite3.connect(str(tmp_epc_db))
+        conn.execute("DROP INDEX idx_epc_postcode")
+        conn.execute("CREATE INDEX by_pc ON epc_addresses (postcode, uprn)")
+        conn.commit()
+        conn.close()
+        build_index(tmp_epc_db)
+        conn = sqlite3.connect(str(tmp_epc_db))
+        names = [row[1] for row in conn.execute("PRAGMA index_list(epc_addresses)")]
+        conn.close()
+        assert "idx_epc_postcode" not in names
+
+    def test_missing_db(self, tmp_path: Path):
+        with pytest.raises(DatabaseNotFound):
+            build_index(tmp_path / "nope.db")
+
+    def test_wrong_db(self, tmp_os_db: Path):
+        with pytest.raises(DatabaseInvalid):
+            build_index(tmp_os_db)
+
+    def test_locked_db(self, tmp_epc_db: Path, monkeypatch):
+        from ukgeolocate import index
+
+        monkeypatch.setattr(index, "_BUSY_TIMEOUT", 0.0)
+        writer = sqlite3.connect(str(tmp_epc_db), isolation_level=None)
+        writer.execute("BEGIN EXCLUSIVE")
+        try:
+            with pytest.raises(DatabaseInvalid, match="locked"):
+                build_index(tmp_epc_db)
+            with pytest.raises(DatabaseInvalid, match="locked"):
+                build_flat_index(tmp_epc_db)
+        finally:
+            writer.close()
+
+
+class TestClientWithIndex:
+    def test_uses_prenormalised_columns(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            before = c.find_coordinates("SW1A 2AA", "10 Downing Street")
+        build_index(tmp_epc_db)
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            assert all(col in c._epc_sql for col in NORM_COLUMNS)
+            assert c.find_coordinates("SW1A 2AA", "10 Downing Street") == before
+
+    def test_rows_added_after_build(self, tmp_epc_db: Path, tmp_os_db: Path):
+        build_index(tmp_epc_db)
+        conn = sqlite3.connect(str(tmp_epc_db))
+        conn.execute("DELETE FROM epc_addresses WHERE lmk_key = 'lmk004'")
+        conn.execute(
+            "INSERT INTO epc_addresses (lmk_key, postcode, address1, address, uprn) "
+            "VALUES ('lmk004', 'M1 1AE', '50 HIGH STREET', "
+            "'50, HIGH STREET, MANCHESTER', '300000000001')"
+        )
+        conn.commit()
+        conn.close()
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            result = c.find_coordinates("M1 1AE", "50 High Street")
+        assert result.uprn == 300000000001
+        assert result.match_score == 1.0
+
+
+class TestFlatIndex:
+    QUERIES = [
+        ("SW1A 2AA", "10 Downing Street"),
+        ("SW1A 2AA", "11 Downing St"),
+        ("EC1A 1BB", "Flat A 1 Example Road"),
+        ("M1 1AE", "50 High Street"),
+    ]
+
+    def test_matches_sqlite_results(self, tmp_epc_db: Path, tmp_os_db: Path):
+        index_path = build_flat_index(tmp_epc_db)
+        assert index_path == Path(f"{tmp_epc_db}.idx")
+        with UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db) as c:
+            expected = [c.find_coordinates(*q) for q in self.QUERIES]
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=index_path
+        ) as c:
+            assert [c.find_coordinates(*q) for q in self.QUERIES] == expected
+            assert c.find_coordinates_many(self.QUERIES) == expected
+
+    def test_unknown_postcode(self, tmp_epc_db: Path, tmp_os_db: Path):
+        index_path = build_flat_index(tmp_epc_db, tmp_epc_db.parent / "x.idx")
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=index_path
+        ) as c:
+            for pc in ("EH1 1YZ", "A1 1AA", "SW1A 2AB"):
+                with pytest.raises(NoMatchFound):
+                    c.find_coordinates(pc, "10 Downing Street")
+
+    def test_bad_uprn_row_excluded(self, tmp_epc_db: Path, tmp_os_db: Path):
+        index_path = build_flat_index(tmp_epc_db)
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=index_path
+        ) as c:
+            owners, _ = c._candidates("SW1A 2AA")
+        assert [uprn for uprn, _ in owners] == [100023336956, 100023336957]
+
+    def test_index_reopened_after_close(self, tmp_epc_db: Path, tmp_os_db: Path):
+        index_path = build_flat_index(tmp_epc_db)
+        with UKGeolocate(
+            epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=index_path
+        ) as c:
+            expected = c.find_coordinates(*self.QUERIES[0])
+            c.close()
+            assert c._epc_index._mm is None
+            assert c.find_coordinates(*self.QUERIES[0]) == expected
+            assert c._epc_index._mm is not None
+
+    def test_close_while_other_threads_look_up(
+        self, tmp_epc_db: Path, tmp_os_db: Path
+    ):
+        from ukgeolocate._flat import _FlatIndex
+
+        index = _FlatIndex(build_flat_index(tmp_epc_db))
+        key = postcode.normalise("SW1A 2AA")
+        expected = index.candidates(key)
+        assert expected[1]
+
+        def lookup(i: int):
+            if i % 4 == 0:
+                index.close()
+            return index.candidates(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            got = list(pool.map(lookup, range(400)))
+        index.close()
+        assert got == [expected] * 400
+
+    def test_not_an_index(self, tmp_epc_db: Path, tmp_os_db: Path, monkeypatch):
+        from ukgeolocate._db import _DatabasePool
+
+        closed = []
+        real_close = _DatabasePool.close
+        monkeypatch.setattr(
+            _DatabasePool, "close", lambda self: closed.append(real_close(self))
+        )
+        with pytest.raises(DatabaseInvalid):
+            UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=tmp_os_db)
+        assert closed  # the pool's connection is not leaked
+
+    def test_empty_or_truncated_index(self, tmp_epc_db: Path, tmp_os_db: Path):
+        index_path = build_flat_index(tmp_epc_db)
+        data = index_path.read_bytes()
+        for bad in (b"", data[:10], data[:-1]):
+            index_path.write_bytes(bad)
+            with pytest.raises(DatabaseInvalid):
+                UKGeolocate(epc_db=tmp_epc_db, os_db=tmp_os_db, epc_index=index_path)
+
+    def test_missing_index(self, tmp_epc_db: Path, tmp_os_db: Path):
+        with pytest.raises(DatabaseNotFound):
+            UKGeolocate(
+                epc_db=tmp_epc_db,
+                os_db=tmp_os_db,
+                epc_index=tmp_epc_db.parent / "nope.idx",
+            )
+
+    def test_wrong_db(self, tmp_os_db: Path):
+        with pytest.raises(DatabaseInvalid):
+            build_flat_index(tmp_os_db)
+
+
+class TestCli:
+    def test_build_index_command(self, tmp_epc_db: Path, monkeypatch, capsys):
+        from ukgeolocate import cli
+
+        monkeypatch.setattr("sys.argv", ["ukgeolocate", "build-index", str(tmp_epc_db)])
+        cli.main()
+        assert "Indexed 5 addresses" in capsys.readouterr().out
+
+    def test_build_index_flat(self, tmp_epc_db: Path, monkeypatch, capsys):
+        from ukgeolocate import cli
+
+        monkeypatch.setattr(
+            "sys.argv", ["ukgeolocate", "build-index", "--flat", str(tmp_epc_db)]
+        )
+        cli.main()
+        assert "Wrote flat index" in capsys.readouterr().out
+        assert Path(f"{tmp_epc_db}.idx").is_file()
+
+    def test_build_index_locked_db(self, tmp_epc_db: Path, monkeypatch, capsys):
+        from ukgeolocate import cli, index
+
+        monkeypatch.setattr(index, "_BUSY_TIMEOUT", 0.0)
+        monkeypatch.setattr("sys.argv", ["ukgeolocate", "build-index", str(tmp_epc_db)])
+        writer = sqlite3.connect(str(tmp_epc_db), isolation_level=None)
+        writer.execute("BEGIN EXCLUSIVE")
+        try:
+            with pytest.raises(SystemExit) as exc_info:
+                cli.main()
+        finally:
+            writer.close()
+        assert exc_info.value.code == 2
+        assert "database is locked" in capsys.readouterr().err
+
+    def test_build_index_missing_db(self, tmp_path: Path, monkeypatch):
+        from ukgeolocate import cli
+
+        monkeypatch.setattr(
+            "sys.argv", ["ukgeolocate", "build-index", str(tmp_path / "nope.db")]
+        )
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+        assert exc_info.value.code == 2
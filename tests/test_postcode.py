@@ -3,13 +3,13 @@
 import pytest
 
 from ukgeolocate.exceptions import PostcodeInvalid
-from ukgeolocate.postcode import normalise, validate
+from ukgeolocate.postcode import normalise, validate, validate_batch
 
 
 class TestValidate:
     @pytest.mark.parametrize(
         "pc",
-        ["SW1A 2AA", "EC1A 1BB", "W1A 0AX", "M1 1AE", "B33 8TH", "CR2 6XH"],
+        ["SW1A 2AA", "EC1A 1BB", "W1A 0AX", "M1 1AE", "B33 8TH", "CR2 6XH", "GIR 0AA"],
     )
     def test_valid_postcodes(self, pc: str):
         assert validate(pc) is True
@@ -23,7 +23,12 @@ class TestValidate:
 
     @pytest.mark.parametrize(
         "pc",
-        ["12345", "ABCDE", "", "75001", "INVALID", "123 ABC"],
+        [
+            "12345", "ABCDE", "", "75001", "INVALID", "123 ABC", "SW\u0661A 2AA",
+            "QA1 1AA",  # Q never starts a postcode
+            "SW1A 2CA",  # C never appears in the inward code
+            "\u017fW1A 2AA",  # long s case-folds to S
+        ],
     )
     def test_invalid_postcodes(self, pc: str):
         assert validate(pc) is False
@@ -37,6 +42,8 @@ class TestNormalise:
             ("  EC1A1BB  ", "EC1A 1BB"),
             ("m1 1ae", "M1 1AE"),
             ("W1A 0AX", "W1A 0AX"),
+            ("sw1a\t2aa", "SW1A 2AA"),
+            ("gir0aa", "GIR 0AA"),
         ],
     )
     def test_normalise_formats_correctly(self, raw: str, expected: str):
@@ -47,3 +54,26 @@ class TestNormalise:
         with pytest.raises(PostcodeInvalid) as exc_info:
             normalise(bad)
         assert exc_info.value.postcode == bad
+
+
+class TestValidateBatch:
+    BATCH = ["sw1a2aa", "  EC1A 1BB  ", "12345", "", "GIR 0AA", "SW1A 2CA", "ſW1A 2AA"]
+
+    def test_matches_validate(self):
+        assert validate_batch(self.BATCH) == [validate(pc) for pc in self.BATCH]
+
+    def test_empty_batch(self):
+        assert validate_batch([]) == []
+
+    def test_arrow_backend_matches_validate(self):
+        pytest.importorskip("pyarrow")
+        from ukgeolocate import postcode
+
+        assert postcode.pa is not None
+        assert validate_batch(self.BATCH) == [validate(pc) for pc in self.BATCH]
+
+    def test_pure_python_fallback(self, monkeypatch):
+        from ukgeolocate import postcode
+
+        monkeypatch.setattr(postcode, "pa", None)
+        assert postcode.validate_batch(self.BATCH) == [validate(pc) for pc in self.BATCH]